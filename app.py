@@ -8,16 +8,28 @@ import tempfile
 import base64
 import logging
 import json
+import math
 import requests
 import time
 import uuid
+import atexit
+import threading
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from better_profanity import profanity
 from functools import lru_cache
+from contextlib import contextmanager
 import hashlib
+import hmac
 from datetime import datetime
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -68,12 +80,14 @@ WORDS_API_URL = "https://wordsapiv1.p.rapidapi.com/words/{word}"
 # WordsAPI headers - You would need to sign up for a free API key at RapidAPI
 WORDS_API_HEADERS = {
     'x-rapidapi-host': "wordsapiv1.p.rapidapi.com",
-    'x-rapidapi-key': "SIGN_UP_FOR_KEY"  # Replace with your actual API key if available
+    'x-rapidapi-key': os.environ.get('WORDS_API_KEY', "SIGN_UP_FOR_KEY")  # Set WORDS_API_KEY to enable WordsAPI
 }
 
 # 2. Add a cache with TTL for translations and definitions
-CACHE = {}
-CACHE_TTL = 86400  # 24 hours in seconds
+CACHE = OrderedDict()
+CACHE_TTL = float(os.environ.get('CACHE_TTL', 86400))  # 24 hours in seconds
+CACHE_MAX_SIZE = int(os.environ.get('CACHE_MAX_SIZE', 0))  # 0 keeps every entry until it expires
+CACHE_LOCK = threading.Lock()
 
 def get_cache_key(prefix, *args):
     """Generate a unique cache key based on function arguments."""
@@ -81,16 +95,171 @@ def get_cache_key(prefix, *args):
     return hashlib.md5(key_string.encode()).hexdigest()
 
 def get_from_cache(key):
-    """Get item from cache if it exists and is not expired."""
-    if key in CACHE:
-        timestamp, data = CACHE[key]
-        if datetime.now().timestamp() - timestamp < CACHE_TTL:
-            return data
+    """Get item from cache if it exists and is not expired, marking it most recently used."""
+    with CACHE_LOCK:
+        entry = CACHE.get(key)
+        if entry:
+            timestamp, data = entry
+            if datetime.now().timestamp() - timestamp < CACHE_TTL:
+                CACHE.move_to_end(key)
+                return data
+            del CACHE[key]
     return None
 
 def save_to_cache(key, data):
-    """Save item to cache with current timestamp."""
-    CACHE[key] = (datetime.now().timestamp(), data)
+    """Save item to cache with current timestamp, evicting the least recently used entries when full."""
+    with CACHE_LOCK:
+        CACHE[key] = (datetime.now().timestamp(), data)
+        CACHE.move_to_end(key)
+        while CACHE_MAX_SIZE and len(CACHE) > CACHE_MAX_SIZE:
+            CACHE.popitem(last=False)
+
+# 2b. Translation memory shared across words, keyed on (segment, target language)
+TRANSLATION_MEMORY = OrderedDict()
+TRANSLATION_MEMORY_MAX_SIZE = int(os.environ.get('TRANSLATION_MEMORY_MAX_SIZE', 10000))
+TRANSLATION_MEMORY_FILE = os.environ.get('TRANSLATION_MEMORY_FILE')
+TRANSLATION_MEMORY_SAVE_EVERY = 50  # Persist after this many new segments
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')  # Required for endpoints that change shared data
+TRANSLATION_MEMORY_LOCK = threading.Lock()
+TRANSLATION_MEMORY_STATS = {'hits': 0, 'misses': 0, 'unsaved': 0}
+TRANSLATION_MEMORY_SAVER = ThreadPoolExecutor(max_workers=1)
+
+# Lightweight stand-in for googletrans' result object when served from memory
+MemoryTranslation = namedtuple('MemoryTranslation', ['text', 'src'])
+
+def normalize_segment(text):
+    """Normalize a text segment so trivially different copies share one entry."""
+    return ' '.join(str(text).split())
+
+def get_from_translation_memory(text, dest):
+    """Get a translated segment from memory, refreshing its recency."""
+    key = (normalize_segment(text), dest)
+    with TRANSLATION_MEMORY_LOCK:
+        entry = TRANSLATION_MEMORY.get(key)
+        if entry is None:
+            TRANSLATION_MEMORY_STATS['misses'] += 1
+            return None
+        TRANSLATION_MEMORY.move_to_end(key)
+        TRANSLATION_MEMORY_STATS['hits'] += 1
+        return MemoryTranslation(*entry)
+
+def save_to_translation_memory(text, dest, translated_text, src):
+    """Store a translated segment, evicting the least recently used ones."""
+    key = (normalize_segment(text), dest)
+    with TRANSLATION_MEMORY_LOCK:
+        TRANSLATION_MEMORY[key] = (translated_text, src)
+        TRANSLATION_MEMORY.move_to_end(key)
+        while len(TRANSLATION_MEMORY) > TRANSLATION_MEMORY_MAX_SIZE:
+            TRANSLATION_MEMORY.popitem(last=False)
+        TRANSLATION_MEMORY_STATS['unsaved'] += 1
+        should_save = TRANSLATION_MEMORY_STATS['unsaved'] >= TRANSLATION_MEMORY_SAVE_EVERY
+        if should_save:
+            TRANSLATION_MEMORY_STATS['unsaved'] = 0
+    if should_save and TRANSLATION_MEMORY_FILE:
+        # Save off the request's thread; the single saver thread also keeps saves from overlapping
+        TRANSLATION_MEMORY_SAVER.submit(save_translation_memory)
+
+def export_translation_memory():
+    """Return the translation memory as a list of JSON-serializable entries."""
+    with TRANSLATION_MEMORY_LOCK:
+        return [
+            {'segment': segment, 'target_lang': dest, 'translation': text, 'source_lang': src}
+            for (segment, dest), (text, src) in TRANSLATION_MEMORY.items()
+        ]
+
+def import_translation_memory(entries):
+    """Bulk load translation memory entries and return how many were imported."""
+    imported = 0
+    with TRANSLATION_MEMORY_LOCK:
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            segment = entry.get('segment')
+            dest = entry.get('target_lang')
+            translated_text = entry.get('translation')
+            src = entry.get('source_lang', 'en')
+            if not all(isinstance(value, str) for value in (segment, translated_text, src)):
+                continue
+            if not segment.strip() or not translated_text.strip() or dest not in LANGUAGES:
+                continue
+            key = (normalize_segment(segment), dest)
+            TRANSLATION_MEMORY[key] = (translated_text, src)
+            TRANSLATION_MEMORY.move_to_end(key)
+            imported += 1
+        while len(TRANSLATION_MEMORY) > TRANSLATION_MEMORY_MAX_SIZE:
+            TRANSLATION_MEMORY.popitem(last=False)
+    return imported
+
+def read_translation_memory_file():
+    """Return the entries currently persisted in TRANSLATION_MEMORY_FILE."""
+    if not os.path.exists(TRANSLATION_MEMORY_FILE):
+        return []
+    with open(TRANSLATION_MEMORY_FILE, 'r', encoding='utf-8') as memory_file:
+        entries = json.load(memory_file)
+    return entries if isinstance(entries, list) else []
+
+def save_translation_memory():
+    """Persist the translation memory to TRANSLATION_MEMORY_FILE, if configured.
+
+    Every worker process has its own memory, so entries already on disk are merged in rather
+    than overwritten; this process's entries count as the most recently used.
+    """
+    if not TRANSLATION_MEMORY_FILE:
+        return
+    try:
+        with translation_memory_file_lock():
+            entries = export_translation_memory()
+            known = {(entry['segment'], entry['target_lang']) for entry in entries}
+            on_disk = [
+                entry for entry in read_translation_memory_file()
+                if isinstance(entry, dict) and (entry.get('segment'), entry.get('target_lang')) not in known
+            ]
+            merged = (on_disk + entries)[-TRANSLATION_MEMORY_MAX_SIZE:]
+
+            # Write to a temporary file first so a crash never leaves a truncated memory
+            temp_path = f"{TRANSLATION_MEMORY_FILE}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as memory_file:
+                json.dump(merged, memory_file, ensure_ascii=False)
+            os.replace(temp_path, TRANSLATION_MEMORY_FILE)
+    except Exception as e:
+        logger.warning(f"Could not save translation memory: {str(e)}")
+
+@contextmanager
+def translation_memory_file_lock():
+    """Hold an exclusive lock across worker processes while the memory file is read and replaced."""
+    if fcntl is None:
+        # No advisory locks on this platform; saves from concurrent processes may still race
+        yield
+        return
+    with open(f"{TRANSLATION_MEMORY_FILE}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def load_translation_memory():
+    """Load the persisted translation memory from TRANSLATION_MEMORY_FILE, if any."""
+    if not TRANSLATION_MEMORY_FILE or not os.path.exists(TRANSLATION_MEMORY_FILE):
+        return
+    try:
+        with open(TRANSLATION_MEMORY_FILE, 'r', encoding='utf-8') as memory_file:
+            imported = import_translation_memory(json.load(memory_file))
+        logger.info(f"Loaded {imported} translation memory entries")
+    except Exception as e:
+        logger.warning(f"Could not load translation memory: {str(e)}")
+
+def translate_text(text, dest):
+    """Translate a segment, consulting the translation memory before the network."""
+    cached = get_from_translation_memory(text, dest)
+    if cached:
+        return cached
+    translation = translator.translate(text, dest=dest)
+    save_to_translation_memory(text, dest, translation.text, translation.src)
+    return translation
+
+load_translation_memory()
+atexit.register(save_translation_memory)
 
 # 3. Add rate limiting for API protection
 limiter = Limiter(
@@ -155,7 +324,7 @@ def get_languages():
     """Return the list of supported languages."""
     return jsonify(LANGUAGES)
 
-def generate_pronunciation(text, lang):
+def generate_pronunciation(text, lang, timeout=None):
     """Generate pronunciation audio and return as base64."""
     if not text or not lang:
         logger.warning("Missing text or language for pronunciation")
@@ -170,18 +339,25 @@ def generate_pronunciation(text, lang):
         logger.info(f"Generating pronunciation for '{text[:20]}...' in language '{lang}'")
         
         # Generate the audio file
-        tts = gTTS(text=text, lang=lang, slow=False)
+        tts = gTTS(text=text, lang=lang, slow=False, timeout=timeout)
+        give_up_at = time.monotonic() + timeout if timeout else None
         
         # Use a retry mechanism for saving the file to handle potential issues
         max_retries = 3
         for attempt in range(max_retries):
             try:
+                # Retries share the caller's timeout instead of each getting a fresh one
+                if give_up_at is not None:
+                    remaining = give_up_at - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Pronunciation timeout exceeded")
+                    tts.timeout = remaining
                 tts.save(file_path)
                 # Add a small delay to ensure file is fully written
                 time.sleep(0.2)
                 break
             except Exception as e:
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and not isinstance(e, TimeoutError):
                     logger.warning(f"Attempt {attempt+1} failed to save audio file: {str(e)}. Retrying...")
                     time.sleep(0.5)  # Wait longer before retry
                 else:
@@ -232,35 +408,745 @@ def clear_search_history():
     SEARCH_HISTORY = []
     return jsonify({"status": "success", "message": "History cleared"})
 
-# 5. Improve the search_word function with caching
-@app.route('/api/search', methods=['POST'])
-@limiter.limit("30 per minute")  # Add rate limiting
-def search_word():
-    """Search for a word's definition, translation, and pronunciation."""
+def check_admin_token():
+    """Return an error response unless the request carries the configured admin token."""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Translation memory access is disabled'}), 403
+
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({'error': 'Invalid admin token'}), 403
+
+    return None
+
+@app.route('/api/translation-memory', methods=['GET'])
+def get_translation_memory():
+    """Export the translation memory for backup or for seeding another instance. Requires the X-Admin-Token header."""
+    # Segments include the words users searched for, so the export is as sensitive as the searches
+    error = check_admin_token()
+    if error:
+        return error
+
+    return jsonify({
+        'entries': export_translation_memory(),
+        'stats': {
+            'size': len(TRANSLATION_MEMORY),
+            'max_size': TRANSLATION_MEMORY_MAX_SIZE,
+            'hits': TRANSLATION_MEMORY_STATS['hits'],
+            'misses': TRANSLATION_MEMORY_STATS['misses']
+        }
+    })
+
+@app.route('/api/translation-memory', methods=['POST'])
+def load_translation_memory_entries():
+    """Bulk import translation memory entries. Requires the X-Admin-Token header."""
+    error = check_admin_token()
+    if error:
+        return error
+
     if not request.is_json:
         return jsonify({'error': 'Request must be JSON'}), 400
-    
+
     data = request.json
-    word = data.get('word')
-    target_lang = data.get('target_lang', 'en')
-    
-    if not word:
-        return jsonify({'error': 'Word is required'}), 400
-    
-    if target_lang not in LANGUAGES:
-        return jsonify({'error': f'Unsupported language: {target_lang}'}), 400
-    
-    # Check cache first
-    cache_key = get_cache_key('search', word, target_lang)
-    cached_result = get_from_cache(cache_key)
-    if cached_result:
-        logger.info(f"Cache hit for word: {word} in {target_lang}")
-        return jsonify(cached_result)
-    
+    # Accept either a bare export list or the {"entries": [...]} export payload
+    entries = data.get('entries', []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return jsonify({'error': 'Entries array is required'}), 400
+
+    imported = import_translation_memory(entries)
+    save_translation_memory()
+    return jsonify({
+        'status': 'success',
+        'imported': imported,
+        'skipped': len(entries) - imported,
+        'size': len(TRANSLATION_MEMORY)
+    })
+
+# 4b. Opt-in traffic capture for cache and capacity planning (see replay.py)
+TRACE_FILE = os.environ.get('TRACE_FILE')
+TRACE_SALT = os.environ.get('TRACE_SALT')
+TRACE_LOCK = threading.Lock()
+
+def load_trace_salt():
+    """Return the salt for hashing traced words, generating one next to the trace when none is configured."""
+    if TRACE_SALT:
+        return TRACE_SALT
+    salt_path = f"{TRACE_FILE}.salt"
     try:
-        logger.info(f"Searching for word: {word} in {target_lang}")
-        
-        result = {
+        # Exclusive create so every worker process ends up sharing the first salt written
+        fd = os.open(salt_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as salt_file:
+            salt_file.write(uuid.uuid4().hex + uuid.uuid4().hex)
+        logger.info(f"Generated trace salt in {salt_path}")
+    except FileExistsError:
+        pass
+    # Another worker may have just created the file, so give it a moment to be written
+    for _ in range(10):
+        with open(salt_path, 'r') as salt_file:
+            salt = salt_file.read().strip()
+        if salt:
+            return salt
+        time.sleep(0.05)
+    raise ValueError(f"Trace salt file {salt_path} is empty")
+
+if TRACE_FILE:
+    try:
+        TRACE_SALT = load_trace_salt()
+    except Exception as e:
+        # Never write traces with unsalted, reversible word hashes
+        logger.error(f"Traffic capture disabled, no trace salt available: {str(e)}")
+        TRACE_FILE = None
+
+def anonymize_word(word):
+    """Replace a searched word with a keyed hash so traces carry no search terms.
+
+    The word is hashed exactly as get_cache_key sees it, so replayed hits and misses match production.
+    """
+    return hmac.new(TRACE_SALT.encode(), str(word).encode(), hashlib.sha256).hexdigest()[:16]
+
+def new_trace_record(endpoint, word, target_lang):
+    """Start a trace record for a request, or return None when capture is off."""
+    if not TRACE_FILE:
+        return None
+    return {
+        'endpoint': endpoint,
+        'word': anonymize_word(word),
+        'target_lang': target_lang,
+        'timestamp': round(time.time(), 3)
+    }
+
+def append_trace(record):
+    """Append one request record to the JSONL trace file."""
+    try:
+        with TRACE_LOCK:
+            with open(TRACE_FILE, 'a', encoding='utf-8') as trace_file:
+                trace_file.write(json.dumps(record) + '\n')
+    except Exception as e:
+        logger.warning(f"Could not write trace record: {str(e)}")
+
+def record_trace(job, **fields):
+    """Merge fields into a search's trace record, writing it once both the response and pipeline are finished."""
+    if not TRACE_FILE:
+        return
+    with job['lock']:
+        job['trace'].update(fields)
+        if job['trace_written'] or 'cache' not in job['trace'] or 'stages' not in job['trace']:
+            return
+        job['trace_written'] = True
+        record = dict(job['trace'])
+    append_trace(record)
+
+# 5. Improve the search_word function with caching and a per-request deadline
+SEARCH_DEADLINE = float(os.environ.get('SEARCH_DEADLINE', 8))  # seconds the client waits by default
+MAX_SEARCH_DEADLINE = 20  # Upper bound for a client-supplied deadline, kept well below gunicorn's worker timeout (see Procfile)
+BACKGROUND_GRACE_PERIOD = float(os.environ.get('BACKGROUND_GRACE_PERIOD', 20))  # Extra seconds background work may use
+MIN_UPSTREAM_TIMEOUT = 0.5  # Floor for upstream timeouts so a call started near the end can still connect
+SEARCH_JOB_TTL = 300  # Seconds a search can be fetched by id after it started
+SEARCH_SECTIONS = ['definitions', 'translation', 'translation_pronunciation', 'translated_definitions', 'pronunciation']
+SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get('SEARCH_WORKERS', 8)))
+# Separate pool for stages a pipeline waits on, so pipelines never wait on their own pool
+STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get('STAGE_WORKERS', 16)))
+SEARCH_JOBS = {}
+IN_FLIGHT_SEARCHES = {}  # cache_key -> job whose result is not cached yet
+SEARCH_JOBS_LOCK = threading.Lock()
+
+class Deadline:
+    """Time budget for a single search, shared by every stage of the pipeline."""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left before the client gets whatever sections are finished."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def exhausted(self):
+        """Whether the background grace period has run out too, so stages should not start."""
+        return time.monotonic() >= self.expires_at + BACKGROUND_GRACE_PERIOD
+
+    def timeout(self):
+        """Timeout for an upstream call: whatever is left of the budget and the background grace period."""
+        return max(MIN_UPSTREAM_TIMEOUT, self.expires_at + BACKGROUND_GRACE_PERIOD - time.monotonic())
+
+# Dictionary providers, ordered adaptively and hedged when the leader runs slow
+PROVIDER_WINDOW = 100  # Recent calls per provider used for latency and success statistics
+PROVIDER_MAX_AGE = 300  # Seconds after which a call no longer counts towards a provider's statistics
+PROVIDER_PROBE_INTERVAL = 60  # Seconds after which an idle formal provider leads once to refresh its statistics
+PROVIDER_MIN_SAMPLES = 5  # Calls needed before a provider's own p95 is trusted
+FORMAL_PREFERENCE = 0.5  # Providers below this preference are only a last resort and never hedged to
+DEFAULT_HEDGE_DELAY = 2.0  # Seconds to wait before hedging while a provider has too few samples
+PROVIDER_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get('PROVIDER_WORKERS', 16)))
+
+def empty_definitions_section():
+    """Return the definitions section of a search result with nothing found yet."""
+    return {
+        'definitions': [],
+        'examples': [],
+        'synonyms': [],
+        'antonyms': [],
+        'phonetics': [],
+        'audio': None
+    }
+
+def fetch_free_dictionary(word, target_lang, deadline):
+    """Fetch definitions from the Free Dictionary API."""
+    section = empty_definitions_section()
+    dict_response = requests.get(
+        DICTIONARY_API_URL.format(lang=target_lang, word=word),
+        timeout=deadline.timeout()
+    )
+    # A 404 is a definite "no such word", anything else unexpected counts against the provider
+    if dict_response.status_code == 404:
+        return section
+    dict_response.raise_for_status()
+
+    dict_data = dict_response.json()
+    if dict_data and len(dict_data) > 0:
+        entry = dict_data[0]
+
+        # Get phonetics
+        if 'phonetics' in entry and entry['phonetics']:
+            for phonetic in entry['phonetics']:
+                phonetic_obj = {
+                    'text': phonetic.get('text', ''),
+                }
+
+                # Get audio if available
+                if phonetic.get('audio') and not section['audio']:
+                    section['audio'] = phonetic.get('audio')
+
+                section['phonetics'].append(phonetic_obj)
+
+        # Get meanings
+        if 'meanings' in entry:
+            for meaning in entry['meanings']:
+                part_of_speech = meaning.get('partOfSpeech', '')
+
+                # Get definitions and filter out inappropriate ones
+                if 'definitions' in meaning:
+                    clean_definitions = remove_bad_definitions(meaning['definitions'], part_of_speech)
+                    section['definitions'].extend(clean_definitions)
+
+                    # Add examples to the examples list
+                    for def_obj in clean_definitions:
+                        if 'example' in def_obj:
+                            section['examples'].append(def_obj['example'])
+
+                # Get synonyms
+                if 'synonyms' in meaning and meaning['synonyms']:
+                    section['synonyms'].extend(meaning['synonyms'])
+
+                # Get antonyms
+                if 'antonyms' in meaning and meaning['antonyms']:
+                    section['antonyms'].extend(meaning['antonyms'])
+
+    return section
+
+def fetch_words_api(word, target_lang, deadline):
+    """Fetch definitions from WordsAPI."""
+    section = empty_definitions_section()
+    words_response = requests.get(
+        WORDS_API_URL.format(word=word),
+        headers=WORDS_API_HEADERS,
+        timeout=deadline.timeout()
+    )
+    if words_response.status_code == 404:
+        return section
+    words_response.raise_for_status()
+
+    words_data = words_response.json()
+    if 'results' in words_data and words_data['results']:
+        for item in words_data['results']:
+            def_text = item.get('definition', '')
+            part_of_speech = item.get('partOfSpeech', '')
+
+            # Only add appropriate definitions
+            if is_appropriate_definition(def_text):
+                def_obj = {
+                    'definition': def_text,
+                    'part_of_speech': part_of_speech,
+                }
+
+                # Add example if available
+                if 'examples' in item and item['examples']:
+                    example_text = item['examples'][0]
+                    if not profanity.contains_profanity(example_text):
+                        def_obj['example'] = example_text
+                        section['examples'].append(example_text)
+
+                section['definitions'].append(def_obj)
+
+        # Get synonyms
+        if 'synonyms' in words_data and words_data['synonyms']:
+            section['synonyms'].extend(words_data['synonyms'])
+
+        # Get antonyms
+        if 'antonyms' in words_data and words_data['antonyms']:
+            section['antonyms'].extend(words_data['antonyms'])
+
+    return section
+
+def fetch_urban_dictionary(word, target_lang, deadline):
+    """Fetch definitions from Urban Dictionary, filtering out inappropriate content."""
+    section = empty_definitions_section()
+    urban_response = requests.get(
+        URBAN_DICTIONARY_API_URL.format(word=word),
+        timeout=deadline.timeout()
+    )
+    urban_response.raise_for_status()
+
+    urban_data = urban_response.json()
+    if 'list' in urban_data and urban_data['list']:
+        # Filter and sort by thumbs up to get more reliable definitions
+        filtered_defs = []
+
+        for item in urban_data['list']:
+            def_text = item.get('definition', '').replace('[', '').replace(']', '')
+
+            # Only add appropriate definitions
+            if is_appropriate_definition(def_text):
+                filtered_defs.append(item)
+
+        # Sort by thumbs up count to get more reliable definitions
+        filtered_defs.sort(key=lambda x: x.get('thumbs_up', 0), reverse=True)
+
+        # Get top 3 definitions
+        for item in filtered_defs[:3]:
+            def_text = item.get('definition', '').replace('[', '').replace(']', '')
+
+            def_obj = {
+                'definition': def_text,
+                'part_of_speech': 'slang',
+            }
+
+            if item.get('example'):
+                example_text = item.get('example', '').replace('[', '').replace(']', '')
+                if not profanity.contains_profanity(example_text):
+                    def_obj['example'] = example_text
+                    section['examples'].append(example_text)
+
+            section['definitions'].append(def_obj)
+
+    return section
+
+class ProviderStats:
+    """Rolling latency and success statistics for one dictionary provider."""
+
+    def __init__(self, name, fetch, preference):
+        self.name = name
+        self.fetch = fetch
+        # Quality weight; providers below FORMAL_PREFERENCE are only used when formal ones find nothing
+        self.preference = preference
+        self.calls = deque(maxlen=PROVIDER_WINDOW)
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def formal(self):
+        """Whether this provider gives formal definitions and may be hedged to."""
+        return self.preference >= FORMAL_PREFERENCE
+
+    def recent_calls(self):
+        """Calls within PROVIDER_MAX_AGE, dropping older ones so stale outcomes stop counting."""
+        cutoff = time.monotonic() - PROVIDER_MAX_AGE
+        with self.lock:
+            while self.calls and self.calls[0][0] < cutoff:
+                self.calls.popleft()
+            return list(self.calls)
+
+    def record(self, latency, success):
+        """Record the outcome of one call."""
+        with self.lock:
+            self.calls.append((time.monotonic(), latency, success))
+
+    def claim_probe(self):
+        """Return True, at most once per PROVIDER_PROBE_INTERVAL, if the provider has gone unused that long."""
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_used < PROVIDER_PROBE_INTERVAL:
+                return False
+            self.last_used = now
+            return True
+
+    def mark_used(self):
+        """Note that a request was sent to this provider."""
+        with self.lock:
+            self.last_used = time.monotonic()
+
+    def success_rate(self):
+        """Smoothed success rate, optimistic for providers with few samples."""
+        calls = self.recent_calls()
+        successes = sum(1 for _, _, success in calls if success)
+        return (successes + 1) / (len(calls) + 1)
+
+    def latency_percentile(self, percentile):
+        """Latency percentile in seconds over recent calls, or None without enough samples."""
+        latencies = sorted(latency for _, latency, _ in self.recent_calls())
+        if len(latencies) < PROVIDER_MIN_SAMPLES:
+            return None
+        index = min(len(latencies) - 1, int(round(percentile / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def hedge_delay(self):
+        """How long to wait on this provider before also asking the next one."""
+        p95 = self.latency_percentile(95)
+        return p95 if p95 is not None else DEFAULT_HEDGE_DELAY
+
+    def score(self):
+        """Higher is better: likely to succeed, quickly, and preferred for quality."""
+        p50 = self.latency_percentile(50)
+        if p50 is None:
+            p50 = DEFAULT_HEDGE_DELAY / 2
+        return self.preference * self.success_rate() / (p50 + 0.05)
+
+    def to_dict(self):
+        """Summary for the health endpoint."""
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            'calls': len(self.recent_calls()),
+            'formal': self.formal,
+            'success_rate': round(self.success_rate(), 3),
+            'p50': round(p50, 3) if p50 is not None else None,
+            'p95': round(p95, 3) if p95 is not None else None,
+            'score': round(self.score(), 3)
+        }
+
+DICTIONARY_PROVIDERS = {
+    'free_dictionary': ProviderStats('free_dictionary', fetch_free_dictionary, preference=1.0),
+    'words_api': ProviderStats('words_api', fetch_words_api, preference=0.8),
+    'urban_dictionary': ProviderStats('urban_dictionary', fetch_urban_dictionary, preference=0.2),
+}
+
+def rank_providers(target_lang):
+    """Return the formal and last-resort providers usable for this search, each best score first."""
+    names = []
+    if target_lang == 'en':
+        names.append('free_dictionary')
+        if WORDS_API_HEADERS['x-rapidapi-key'] != "SIGN_UP_FOR_KEY":
+            names.append('words_api')
+    names.append('urban_dictionary')
+    providers = sorted((DICTIONARY_PROVIDERS[name] for name in names), key=lambda p: p.score(), reverse=True)
+    formal = [provider for provider in providers if provider.formal]
+    last_resort = [provider for provider in providers if not provider.formal]
+
+    # A demoted provider only sees hedged traffic, so let it lead now and then to refresh its statistics
+    for provider in formal[1:]:
+        if provider.claim_probe():
+            formal.remove(provider)
+            formal.insert(0, provider)
+            break
+    return formal, last_resort
+
+def call_provider(provider, word, target_lang, deadline):
+    """Call one provider, recording its latency and outcome. Returns None on failure."""
+    start = time.monotonic()
+    try:
+        section = provider.fetch(word, target_lang, deadline)
+        provider.record(time.monotonic() - start, True)
+        return section
+    except Exception as e:
+        provider.record(time.monotonic() - start, False)
+        logger.error(f"Error fetching {provider.name} data: {str(e)}")
+        return None
+
+def fetch_definitions(word, target_lang, deadline):
+    """Fetch definitions from the best formal provider, hedging to the next formal one when it runs slow."""
+    queue, last_resort = rank_providers(target_lang)
+    pending = {}
+    answered = False
+
+    def start_next():
+        provider = queue.pop(0)
+        provider.mark_used()
+        pending[PROVIDER_EXECUTOR.submit(call_provider, provider, word, target_lang, deadline)] = provider
+        return provider
+
+    last_started = start_next() if queue else None
+    while pending:
+        # Hedge once the newest request runs past its usual p95; otherwise wait for any answer
+        wait_for = last_started.hedge_delay() if queue else deadline.timeout()
+        done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        if not done:
+            if not queue:
+                break
+            logger.info(f"{last_started.name} is slower than usual for {word}, hedging")
+            last_started = start_next()
+            continue
+
+        for future in done:
+            provider = pending.pop(future)
+            section = future.result()
+            answered = answered or section is not None
+            if section and section['definitions']:
+                logger.info(f"Definitions for {word} served by {provider.name}")
+                return section
+
+        # Every finished provider came back empty, so fall through to the next one
+        if queue and not pending:
+            last_started = start_next()
+
+    # Only when no formal source has definitions, try the last-resort ones in order
+    for provider in last_resort:
+        if deadline.exhausted():
+            logger.warning(f"Search budget exhausted before trying {provider.name} for {word}")
+            break
+        provider.mark_used()
+        section = call_provider(provider, word, target_lang, deadline)
+        answered = answered or section is not None
+        if section and section['definitions']:
+            logger.info(f"Definitions for {word} served by {provider.name}")
+            return section
+
+    # An empty answer means the word is unknown; no answer at all means the section failed
+    return empty_definitions_section() if answered else None
+
+def translate_word(word, target_lang, deadline):
+    """Translate the word itself into the target language."""
+    translation = translate_text(word, target_lang)
+    return {
+        'translation': translation.text,
+        'source_language': translation.src
+    }
+
+def pronounce_translation(translation, target_lang, deadline):
+    """Generate pronunciation for the translated word."""
+    translation_audio = generate_pronunciation(translation, target_lang, timeout=deadline.timeout())
+    if not translation_audio:
+        return None
+    return {'translation_pronunciation': translation_audio}
+
+def fetch_translated_definitions(translation, target_lang, definitions, examples, deadline):
+    """Get definitions and examples in the target language."""
+    section = {
+        'translated_definitions': [],
+        'translated_examples': []
+    }
+
+    # First, try to find definitions for the translated word in the target language
+    if target_lang in ['es', 'fr', 'de', 'it', 'pt', 'ru']:  # Languages supported by Free Dictionary API
+        try:
+            target_dict_response = requests.get(
+                DICTIONARY_API_URL.format(lang=target_lang, word=translation),
+                timeout=deadline.timeout()
+            )
+
+            if target_dict_response.status_code == 200:
+                target_dict_data = target_dict_response.json()
+
+                if target_dict_data and len(target_dict_data) > 0:
+                    entry = target_dict_data[0]
+
+                    # Get meanings in target language
+                    if 'meanings' in entry:
+                        for meaning in entry['meanings']:
+                            part_of_speech = meaning.get('partOfSpeech', '')
+
+                            # Get definitions in target language
+                            if 'definitions' in meaning:
+                                clean_definitions = remove_bad_definitions(
+                                    meaning['definitions'],
+                                    part_of_speech
+                                )
+                                section['translated_definitions'].extend(clean_definitions)
+
+                                # Add examples to the translated examples list
+                                for def_obj in clean_definitions:
+                                    if 'example' in def_obj:
+                                        section['translated_examples'].append(def_obj['example'])
+        except Exception as e:
+            logger.error(f"Error fetching target language dictionary data: {str(e)}")
+
+    # If no definitions found in target language, translate the English definitions
+    if not section['translated_definitions'] and definitions:
+        for definition in definitions:
+            if deadline.exhausted():
+                logger.warning(f"Search budget exhausted while translating definitions to {target_lang}")
+                break
+            try:
+                # Translate the definition
+                translated_def = translate_text(definition['definition'], target_lang)
+
+                # Add to translated definitions
+                section['translated_definitions'].append({
+                    'definition': translated_def.text,
+                    'part_of_speech': definition['part_of_speech']
+                })
+
+                # Translate example if available
+                if 'example' in definition:
+                    translated_example = translate_text(definition['example'], target_lang)
+                    section['translated_examples'].append(translated_example.text)
+            except Exception as e:
+                logger.error(f"Error translating definition: {str(e)}")
+                continue
+
+    # Translate some examples if none are found
+    if not section['translated_examples'] and examples:
+        examples_to_translate = examples[:3]  # Translate up to 3 examples
+        for example in examples_to_translate:
+            if deadline.exhausted():
+                break
+            try:
+                translated_example = translate_text(example, target_lang)
+                section['translated_examples'].append(translated_example.text)
+            except Exception as e:
+                logger.error(f"Error translating example: {str(e)}")
+                continue
+
+    return section
+
+def pronounce_original_word(word, source_lang, deadline):
+    """Generate pronunciation for the original word."""
+    audio_base64 = generate_pronunciation(word, source_lang, timeout=deadline.timeout())
+    if not audio_base64:
+        return None
+    return {'pronunciation': audio_base64}
+
+def run_stage(job, section, deadline, stage, *args):
+    """Run one pipeline stage and publish its fields, marking the section skipped on failure."""
+    fields = None
+    if deadline.exhausted():
+        logger.warning(f"Skipping {section} for {job['result']['word']}: search budget exhausted")
+    else:
+        start = time.monotonic()
+        try:
+            fields = stage(*args, deadline)
+        except Exception as e:
+            logger.error(f"Error in {section} stage: {str(e)}")
+        latency_ms = round((time.monotonic() - start) * 1000, 1)
+        with job['lock']:
+            job['stage_latencies'][section] = latency_ms
+
+    with job['lock']:
+        if fields is not None:
+            job['result'].update(fields)
+            job['sections'][section] = 'done'
+        else:
+            job['sections'][section] = 'skipped'
+    return fields
+
+def skip_sections(job, *sections, applies=False):
+    """Mark sections as skipped. Sections that do not apply to this search still leave it cacheable."""
+    with job['lock']:
+        for section in sections:
+            job['sections'][section] = 'skipped'
+            if not applies:
+                job['not_applicable'].add(section)
+
+def run_search(job, deadline):
+    """Run every stage of a search, then cache the result and record it in history."""
+    word = job['result']['word']
+    target_lang = job['result']['target_language']
+
+    # Stages run in parallel wherever they do not depend on each other's output
+    stages = []
+
+    def start_stage(*args):
+        future = STAGE_EXECUTOR.submit(run_stage, job, *args)
+        stages.append(future)
+        return future
+
+    try:
+        definitions_future = start_stage('definitions', deadline, fetch_definitions, word, target_lang)
+
+        # Translate the word if target language is not English
+        translation = None
+        if target_lang != 'en' and translator:
+            translation = run_stage(job, 'translation', deadline, translate_word, word, target_lang)
+            if not translation:
+                skip_sections(job, 'translation_pronunciation', 'translated_definitions', applies=True)
+        else:
+            skip_sections(job, 'translation', 'translation_pronunciation', 'translated_definitions')
+
+        # Generate pronunciation for the original word, in the language the translator detected
+        source_lang = translation['source_language'] if translation else 'en'
+        start_stage('pronunciation', deadline, pronounce_original_word, word, source_lang)
+
+        if translation:
+            start_stage('translation_pronunciation', deadline, pronounce_translation,
+                        translation['translation'], target_lang)
+
+            # Translated definitions fall back to translating the English ones, so they wait for them
+            definitions = definitions_future.result()
+            run_stage(job, 'translated_definitions', deadline, fetch_translated_definitions,
+                      translation['translation'], target_lang,
+                      definitions['definitions'] if definitions else [],
+                      definitions['examples'] if definitions else [])
+    except Exception as e:
+        logger.error(f"Error in search pipeline for {word}: {str(e)}")
+    finally:
+        wait(stages)
+        with job['lock']:
+            for section, status in job['sections'].items():
+                if status == 'pending':
+                    job['sections'][section] = 'skipped'
+            response = build_search_response(job)
+            stage_latencies = dict(job['stage_latencies'])
+        job['done'].set()
+        record_trace(job, stages=stage_latencies, skipped=response['skipped_sections'])
+
+    # Add to search history
+    timestamp = datetime.now().isoformat()
+    history_entry = {
+        'word': word,
+        'target_language': target_lang,
+        'timestamp': timestamp,
+        'has_definition': bool(response['definitions']),
+        'has_translation': bool(response.get('translation'))
+    }
+
+    SEARCH_HISTORY.insert(0, history_entry)
+    if len(SEARCH_HISTORY) > MAX_HISTORY_SIZE:
+        SEARCH_HISTORY.pop()
+
+    # Save the completed result to cache so later searches are served instantly, unless an
+    # upstream failure or the budget left sections out; then the next search tries again
+    degraded = [s for s in response['skipped_sections'] if s not in job['not_applicable']]
+    if degraded:
+        logger.warning(f"Not caching {word} in {target_lang}, skipped sections: {', '.join(degraded)}")
+    else:
+        cached = dict(response)
+        cached.pop('search_id', None)
+        save_to_cache(job['cache_key'], cached)
+
+    # Only now can repeated searches stop joining this job; they hit the cache or start afresh
+    with SEARCH_JOBS_LOCK:
+        if IN_FLIGHT_SEARCHES.get(job['cache_key']) is job:
+            del IN_FLIGHT_SEARCHES[job['cache_key']]
+
+def build_search_response(job):
+    """Snapshot the current state of a search. Call with the job lock held."""
+    response = dict(job['result'])
+    response['search_id'] = job['id']
+    response['complete'] = not any(status == 'pending' for status in job['sections'].values())
+    response['pending_sections'] = [s for s, status in job['sections'].items() if status == 'pending']
+    response['skipped_sections'] = [s for s, status in job['sections'].items() if status == 'skipped']
+    return response
+
+def start_search(word, target_lang, cache_key, deadline):
+    """Join the running search for the same word and language, or start a new one.
+
+    Returns the job and whether it was already running.
+    """
+    now = time.monotonic()
+    with SEARCH_JOBS_LOCK:
+        running = IN_FLIGHT_SEARCHES.get(cache_key)
+        if running and now - running['created'] <= SEARCH_JOB_TTL:
+            return running, True
+
+    job = {
+        'id': uuid.uuid4().hex,
+        'cache_key': cache_key,
+        'created': now,
+        'lock': threading.Lock(),
+        'done': threading.Event(),
+        'stage_latencies': {},
+        'trace': new_trace_record('/api/search', word, target_lang),
+        'trace_written': False,
+        'sections': {section: 'pending' for section in SEARCH_SECTIONS},
+        'not_applicable': set(),
+        'result': {
             'word': word,
             'target_language': target_lang,
             'definitions': [],
@@ -276,256 +1162,108 @@ def search_word():
             'translated_definitions': [],
             'translated_examples': []
         }
-        
-        # Get dictionary definition for source language (English or detected)
-        if target_lang == 'en':
-            # Try the Free Dictionary API first
-            try:
-                dict_response = requests.get(DICTIONARY_API_URL.format(lang=target_lang, word=word))
-                if dict_response.status_code == 200:
-                    dict_data = dict_response.json()
-                    
-                    if dict_data and len(dict_data) > 0:
-                        entry = dict_data[0]
-                        
-                        # Get phonetics
-                        if 'phonetics' in entry and entry['phonetics']:
-                            for phonetic in entry['phonetics']:
-                                phonetic_obj = {
-                                    'text': phonetic.get('text', ''),
-                                }
-                                
-                                # Get audio if available
-                                if phonetic.get('audio') and not result['audio']:
-                                    result['audio'] = phonetic.get('audio')
-                                
-                                result['phonetics'].append(phonetic_obj)
-                        
-                        # Get meanings
-                        if 'meanings' in entry:
-                            for meaning in entry['meanings']:
-                                part_of_speech = meaning.get('partOfSpeech', '')
-                                
-                                # Get definitions and filter out inappropriate ones
-                                if 'definitions' in meaning:
-                                    clean_definitions = remove_bad_definitions(meaning['definitions'], part_of_speech)
-                                    result['definitions'].extend(clean_definitions)
-                                    
-                                    # Add examples to the examples list
-                                    for def_obj in clean_definitions:
-                                        if 'example' in def_obj:
-                                            result['examples'].append(def_obj['example'])
-                                
-                                # Get synonyms
-                                if 'synonyms' in meaning and meaning['synonyms']:
-                                    result['synonyms'].extend(meaning['synonyms'])
-                                
-                                # Get antonyms
-                                if 'antonyms' in meaning and meaning['antonyms']:
-                                    result['antonyms'].extend(meaning['antonyms'])
-            except Exception as e:
-                logger.error(f"Error fetching dictionary data: {str(e)}")
-            
-            # Try WordsAPI if available and no definitions found
-            if not result['definitions'] and WORDS_API_HEADERS['x-rapidapi-key'] != "SIGN_UP_FOR_KEY":
-                try:
-                    words_response = requests.get(
-                        WORDS_API_URL.format(word=word),
-                        headers=WORDS_API_HEADERS
-                    )
-                    
-                    if words_response.status_code == 200:
-                        words_data = words_response.json()
-                        
-                        if 'results' in words_data and words_data['results']:
-                            for item in words_data['results']:
-                                def_text = item.get('definition', '')
-                                part_of_speech = item.get('partOfSpeech', '')
-                                
-                                # Only add appropriate definitions
-                                if is_appropriate_definition(def_text):
-                                    def_obj = {
-                                        'definition': def_text,
-                                        'part_of_speech': part_of_speech,
-                                    }
-                                    
-                                    # Add example if available
-                                    if 'examples' in item and item['examples']:
-                                        example_text = item['examples'][0]
-                                        if not profanity.contains_profanity(example_text):
-                                            def_obj['example'] = example_text
-                                            result['examples'].append(example_text)
-                                    
-                                    result['definitions'].append(def_obj)
-                            
-                            # Get synonyms
-                            if 'synonyms' in words_data and words_data['synonyms']:
-                                result['synonyms'].extend(words_data['synonyms'])
-                            
-                            # Get antonyms
-                            if 'antonyms' in words_data and words_data['antonyms']:
-                                result['antonyms'].extend(words_data['antonyms'])
-                except Exception as e:
-                    logger.error(f"Error fetching WordsAPI data: {str(e)}")
-        
-        # If no definitions found, try Urban Dictionary as a last resort
-        # But filter out inappropriate content
-        if not result['definitions']:
-            try:
-                urban_response = requests.get(URBAN_DICTIONARY_API_URL.format(word=word))
-                if urban_response.status_code == 200:
-                    urban_data = urban_response.json()
-                    
-                    if 'list' in urban_data and urban_data['list']:
-                        # Filter and sort by thumbs up to get more reliable definitions
-                        filtered_defs = []
-                        
-                        for item in urban_data['list']:
-                            def_text = item.get('definition', '').replace('[', '').replace(']', '')
-                            
-                            # Only add appropriate definitions
-                            if is_appropriate_definition(def_text):
-                                filtered_defs.append(item)
-                        
-                        # Sort by thumbs up count to get more reliable definitions
-                        filtered_defs.sort(key=lambda x: x.get('thumbs_up', 0), reverse=True)
-                        
-                        # Get top 3 definitions
-                        for item in filtered_defs[:3]:
-                            def_text = item.get('definition', '').replace('[', '').replace(']', '')
-                            
-                            def_obj = {
-                                'definition': def_text,
-                                'part_of_speech': 'slang',
-                            }
-                            
-                            if item.get('example'):
-                                example_text = item.get('example', '').replace('[', '').replace(']', '')
-                                if not profanity.contains_profanity(example_text):
-                                    def_obj['example'] = example_text
-                                    result['examples'].append(example_text)
-                            
-                            result['definitions'].append(def_obj)
-            except Exception as e:
-                logger.error(f"Error fetching Urban Dictionary data: {str(e)}")
-        
-        # Translate the word if target language is not English
-        if target_lang != 'en' and translator:
-            try:
-                # Translate the word
-                translation = translator.translate(word, dest=target_lang)
-                result['translation'] = translation.text
-                result['source_language'] = translation.src
-                
-                # Generate pronunciation for the translation
-                translation_audio = generate_pronunciation(translation.text, target_lang)
-                if translation_audio:
-                    result['translation_pronunciation'] = translation_audio
-                
-                # Get definitions and examples in target language
-                # First, try to find definitions for the translated word in the target language
-                if target_lang in ['es', 'fr', 'de', 'it', 'pt', 'ru']:  # Languages supported by Free Dictionary API
-                    try:
-                        target_dict_response = requests.get(DICTIONARY_API_URL.format(
-                            lang=target_lang, 
-                            word=result['translation']
-                        ))
-                        
-                        if target_dict_response.status_code == 200:
-                            target_dict_data = target_dict_response.json()
-                            
-                            if target_dict_data and len(target_dict_data) > 0:
-                                entry = target_dict_data[0]
-                                
-                                # Get meanings in target language
-                                if 'meanings' in entry:
-                                    for meaning in entry['meanings']:
-                                        part_of_speech = meaning.get('partOfSpeech', '')
-                                        
-                                        # Get definitions in target language
-                                        if 'definitions' in meaning:
-                                            clean_definitions = remove_bad_definitions(
-                                                meaning['definitions'], 
-                                                part_of_speech
-                                            )
-                                            result['translated_definitions'].extend(clean_definitions)
-                                            
-                                            # Add examples to the translated examples list
-                                            for def_obj in clean_definitions:
-                                                if 'example' in def_obj:
-                                                    result['translated_examples'].append(def_obj['example'])
-                    except Exception as e:
-                        logger.error(f"Error fetching target language dictionary data: {str(e)}")
-                
-                # If no definitions found in target language, translate the English definitions
-                if not result['translated_definitions'] and result['definitions']:
-                    for definition in result['definitions']:
-                        try:
-                            # Translate the definition
-                            translated_def = translator.translate(
-                                definition['definition'], 
-                                dest=target_lang
-                            )
-                            
-                            # Add to translated definitions
-                            result['translated_definitions'].append({
-                                'definition': translated_def.text,
-                                'part_of_speech': definition['part_of_speech']
-                            })
-                            
-                            # Translate example if available
-                            if 'example' in definition:
-                                translated_example = translator.translate(
-                                    definition['example'], 
-                                    dest=target_lang
-                                )
-                                result['translated_examples'].append(translated_example.text)
-                        except Exception as e:
-                            logger.error(f"Error translating definition: {str(e)}")
-                            continue
-                
-                # Translate some examples if none are found
-                if not result['translated_examples'] and result['examples']:
-                    examples_to_translate = result['examples'][:3]  # Translate up to 3 examples
-                    for example in examples_to_translate:
-                        try:
-                            translated_example = translator.translate(example, dest=target_lang)
-                            result['translated_examples'].append(translated_example.text)
-                        except Exception as e:
-                            logger.error(f"Error translating example: {str(e)}")
-                            continue
-            except Exception as e:
-                logger.error(f"Error translating word: {str(e)}")
-        
-        # Generate pronunciation for the original word
-        source_lang = result['source_language']
-        audio_base64 = generate_pronunciation(word, source_lang)
-        if audio_base64:
-            result['pronunciation'] = audio_base64
-        
-        # Add to search history
-        timestamp = datetime.now().isoformat()
-        history_entry = {
-            'word': word,
-            'target_language': target_lang,
-            'timestamp': timestamp,
-            'has_definition': bool(result['definitions']),
-            'has_translation': bool(result.get('translation'))
-        }
-        
-        SEARCH_HISTORY.insert(0, history_entry)
-        if len(SEARCH_HISTORY) > MAX_HISTORY_SIZE:
-            SEARCH_HISTORY.pop()
-        
-        # Save result to cache
-        save_to_cache(cache_key, result)
-        
-        return jsonify(result)
-    
+    }
+
+    with SEARCH_JOBS_LOCK:
+        # Another request may have started the same search while this job was being built
+        running = IN_FLIGHT_SEARCHES.get(cache_key)
+        if running and now - running['created'] <= SEARCH_JOB_TTL:
+            return running, True
+
+        # Forget searches nobody can reasonably come back for
+        for search_id in [i for i, j in SEARCH_JOBS.items() if now - j['created'] > SEARCH_JOB_TTL]:
+            del SEARCH_JOBS[search_id]
+        SEARCH_JOBS[job['id']] = job
+        IN_FLIGHT_SEARCHES[cache_key] = job
+
+    SEARCH_EXECUTOR.submit(run_search, job, deadline)
+    return job, False
+
+@app.route('/api/search', methods=['POST'])
+@limiter.limit("30 per minute")  # Add rate limiting
+def search_word():
+    """Search for a word's definition, translation, and pronunciation within a deadline."""
+    if not request.is_json:
+        return jsonify({'error': 'Request must be JSON'}), 400
+
+    data = request.json
+    word = data.get('word')
+    target_lang = data.get('target_lang', 'en')
+
+    if not word:
+        return jsonify({'error': 'Word is required'}), 400
+
+    if target_lang not in LANGUAGES:
+        return jsonify({'error': f'Unsupported language: {target_lang}'}), 400
+
+    try:
+        deadline_seconds = float(data.get('deadline', SEARCH_DEADLINE))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Deadline must be a number of seconds'}), 400
+
+    if not math.isfinite(deadline_seconds) or deadline_seconds <= 0:
+        return jsonify({'error': 'Deadline must be a positive number of seconds'}), 400
+    deadline_seconds = min(deadline_seconds, MAX_SEARCH_DEADLINE)
+
+    # Check cache first
+    started = time.monotonic()
+    cache_key = get_cache_key('search', word, target_lang)
+    cached_result = get_from_cache(cache_key)
+    if cached_result:
+        logger.info(f"Cache hit for word: {word} in {target_lang}")
+        trace = new_trace_record('/api/search', word, target_lang)
+        if trace:
+            trace.update({
+                'cache': 'hit',
+                'latency_ms': round((time.monotonic() - started) * 1000, 1),
+                'stages': {},
+                'skipped': []
+            })
+            append_trace(trace)
+        return jsonify(cached_result)
+
+    try:
+        logger.info(f"Searching for word: {word} in {target_lang} with a {deadline_seconds}s deadline")
+        deadline = Deadline(deadline_seconds)
+        job, joined = start_search(word, target_lang, cache_key, deadline)
+        if joined:
+            logger.info(f"Joining the search already running for word: {word} in {target_lang}")
+
+        # Answer with whatever is finished once the budget runs out; the rest keeps filling the cache
+        if not job['done'].wait(deadline.remaining()):
+            logger.warning(f"Deadline reached for word: {word} in {target_lang}, returning partial result")
+
+        with job['lock']:
+            response = build_search_response(job)
+        latency_ms = round((time.monotonic() - started) * 1000, 1)
+        if not joined:
+            record_trace(job, cache='miss' if response['complete'] else 'partial', latency_ms=latency_ms)
+        else:
+            # The job's own record belongs to the request that started it
+            trace = new_trace_record('/api/search', word, target_lang)
+            if trace:
+                trace.update({'cache': 'in_flight', 'latency_ms': latency_ms, 'stages': {}, 'skipped': []})
+                append_trace(trace)
+        return jsonify(response)
+
     except Exception as e:
         logger.error(f"Error in search_word: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/search/<search_id>', methods=['GET'])
+@limiter.limit("120 per minute")  # Polled by the frontend, so it gets its own limit
+def get_search_result(search_id):
+    """Fetch the current state of a search that returned before all sections were finished."""
+    with SEARCH_JOBS_LOCK:
+        job = SEARCH_JOBS.get(search_id)
+
+    if not job:
+        # Expired, or started by another worker process; re-issuing the search hits the cache
+        return jsonify({'error': 'Search not found, please search again'}), 404
+
+    with job['lock']:
+        return jsonify(build_search_response(job))
+
 @app.route('/api/speech-to-text', methods=['POST'])
 def speech_to_text():
     """Convert speech to text."""
@@ -727,10 +1465,13 @@ def health_check():
             'dictionary': True,
             'tts': True
         },
+        'dictionary_providers': {
+            name: provider.to_dict() for name, provider in DICTIONARY_PROVIDERS.items()
+        },
         'uptime': 'unknown'  # In a production app, you'd track actual uptime
     })
 
 if __name__ == '__main__':
     # Clear cache on startup
-    CACHE = {}
+    CACHE.clear()
     app.run(debug=True, port=8000) 
\ No newline at end of file
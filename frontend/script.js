@@ -7,6 +7,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const micButton = document.getElementById('mic-button');
     const historyList = document.getElementById('history-list');
     const clearHistoryBtn = document.getElementById('clear-history-btn');
+    let currentSearchId = null;
     
     // Fetch and populate languages dropdown
     async function loadLanguages() {
@@ -66,6 +67,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Search for a word
     async function searchWord(word, targetLang) {
+        currentSearchId = null;
         loadingIndicator.classList.remove('hidden');
         resultsContainer.innerHTML = '';
         
@@ -84,8 +86,14 @@ document.addEventListener('DOMContentLoaded', function() {
             const data = await response.json();
             
             if (response.ok) {
+                currentSearchId = data.search_id || null;
                 displayResults(data);
                 loadHistory(); // Refresh history after successful search
+                
+                // The server answered before every section was ready; fetch the rest
+                if (data.complete === false && data.search_id) {
+                    pollSearch(data.search_id);
+                }
             } else {
                 displayError(data.error || 'An error occurred');
             }
@@ -97,6 +105,52 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
+    // Poll for sections that were still pending when the search deadline ran out
+    async function pollSearch(searchId) {
+        for (let attempt = 0; attempt < 20; attempt++) {
+            await new Promise(resolve => setTimeout(resolve, 1500));
+            
+            // Stop if the user has started another search
+            if (searchId !== currentSearchId) {
+                return;
+            }
+            
+            try {
+                const response = await fetch(`/api/search/${searchId}`);
+                if (!response.ok) {
+                    const data = await response.json().catch(() => ({}));
+                    if (searchId === currentSearchId) {
+                        displayError(`Some sections could not be loaded: ${data.error || response.statusText}. Please search again.`);
+                    }
+                    return;
+                }
+                
+                const data = await response.json();
+                if (searchId !== currentSearchId) {
+                    return;
+                }
+                
+                resultsContainer.innerHTML = '';
+                displayResults(data);
+                
+                if (data.complete) {
+                    loadHistory();
+                    return;
+                }
+            } catch (error) {
+                console.error('Failed to fetch pending search sections:', error);
+                if (searchId === currentSearchId) {
+                    displayError('Some sections could not be loaded. Please search again.');
+                }
+                return;
+            }
+        }
+        
+        if (searchId === currentSearchId) {
+            displayError('Some sections are taking too long. Please search again later.');
+        }
+    }
+    
     // Display search results
     function displayResults(data) {
         const resultCard = document.createElement('div');
@@ -0,0 +1,275 @@
+"""Replay a captured search trace against the app with stubbed upstreams.
+
+Capture a trace by running the app with TRACE_FILE set, then replay it under
+different cache sizes, TTLs and worker counts to compare hit ratios,
+throughput and latency percentiles:
+
+    python replay.py trace.jsonl --cache-sizes 0,1000 --ttls 3600,86400 --workers 1,2,4
+
+Every upstream stage (dictionary, translation, TTS, target-language dictionary)
+is replaced by a stub that sleeps for a latency recorded for the same word in
+the trace, so no network calls are made. Each worker is a separate process with
+its own cache, like a gunicorn sync worker.
+
+--speed compresses the gaps between requests and the TTL by the same factor, so
+hit ratios stay comparable while a long trace replays quickly. Stage latencies
+are not compressed, so a higher speed also means a proportionally higher load.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+# Fake section contents returned by the stubbed stages
+STUB_FIELDS = {
+    'definitions': lambda word: {
+        'definitions': [{'definition': f'stub definition of {word}', 'part_of_speech': 'noun'}],
+        'examples': [],
+        'synonyms': [],
+        'antonyms': [],
+        'phonetics': [],
+        'audio': None
+    },
+    'translation': lambda word: {'translation': word, 'source_language': 'en'},
+    'translation_pronunciation': lambda word: {'translation_pronunciation': 'stub'},
+    'translated_definitions': lambda word: {
+        'translated_definitions': [{'definition': f'stub translation of {word}', 'part_of_speech': 'noun'}],
+        'translated_examples': []
+    },
+    'pronunciation': lambda word: {'pronunciation': 'stub'},
+}
+
+# Pipeline function in app.py that implements each stage
+STAGE_FUNCTIONS = {
+    'definitions': 'fetch_definitions',
+    'translation': 'translate_word',
+    'translation_pronunciation': 'pronounce_translation',
+    'translated_definitions': 'fetch_translated_definitions',
+    'pronunciation': 'pronounce_original_word',
+}
+
+def load_trace(path, limit=None):
+    """Load search records from a JSONL trace, sorted by timestamp."""
+    records = []
+    with open(path, 'r', encoding='utf-8') as trace_file:
+        for line in trace_file:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get('endpoint') == '/api/search':
+                records.append(record)
+    records.sort(key=lambda record: record['timestamp'])
+    return records[:limit] if limit else records
+
+def collect_stage_samples(records):
+    """Group recorded stage latencies by word, plus a trace-wide pool per stage for unseen words."""
+    by_word = defaultdict(lambda: defaultdict(list))
+    overall = defaultdict(list)
+    for record in records:
+        skipped = set(record.get('skipped', []))
+        for stage, latency_ms in record.get('stages', {}).items():
+            sample = (latency_ms / 1000, stage not in skipped)
+            by_word[record['word']][stage].append(sample)
+            overall[stage].append(sample)
+    return {word: dict(stages) for word, stages in by_word.items()}, dict(overall)
+
+def install_stubs(wordwise, by_word, overall, latency_scale, seed):
+    """Replace every upstream stage of the search pipeline with a latency-replaying stub."""
+    rng = random.Random(seed)
+
+    def make_stub(stage):
+        def stub(word, *args):
+            # Translated stages receive the stubbed translation, which is the word itself
+            samples = by_word.get(word, {}).get(stage) or overall.get(stage)
+            latency, succeeded = rng.choice(samples) if samples else (0.0, True)
+            time.sleep(latency * latency_scale)
+            return STUB_FIELDS[stage](word) if succeeded else None
+        return stub
+
+    for stage, function_name in STAGE_FUNCTIONS.items():
+        setattr(wordwise, function_name, make_stub(stage))
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def worker_main(config, by_word, overall, request_queue, result_queue):
+    """Serve requests from the queue with one app instance, like a single gunicorn worker."""
+    # Never capture or persist anything while replaying
+    os.environ.pop('TRACE_FILE', None)
+    os.environ.pop('TRANSLATION_MEMORY_FILE', None)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    import logging
+    import warnings
+    logging.disable(logging.CRITICAL)
+    warnings.simplefilter('ignore')  # The rate limiter is disabled below, so its storage warning is noise
+    import app as wordwise
+
+    wordwise.CACHE_MAX_SIZE = config['cache_size']
+    wordwise.CACHE_TTL = config['ttl'] / config['speed']
+    wordwise.limiter.enabled = False
+    install_stubs(wordwise, by_word, overall, config['latency_scale'], config['seed'])
+    client = wordwise.app.test_client()
+    result_queue.put(('ready', None))
+
+    while True:
+        item = request_queue.get()
+        if item is None:
+            break
+        arrival, record = item
+
+        payload = {'word': record['word'], 'target_lang': record['target_lang']}
+        if config['deadline']:
+            payload['deadline'] = config['deadline']
+        response = client.post('/api/search', json=payload)
+        finished = time.time()
+
+        data = response.get_json() or {}
+        if response.status_code != 200:
+            outcome = 'error'
+        elif 'search_id' not in data:
+            outcome = 'hit'
+        elif not data.get('complete'):
+            outcome = 'partial'
+        else:
+            outcome = 'miss'
+        result_queue.put(('result', (outcome, finished - arrival, finished)))
+
+def receive(result_queue, workers):
+    """Take the next message from the workers, failing instead of hanging if they have all died."""
+    while True:
+        try:
+            return result_queue.get(timeout=1)
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                raise RuntimeError('All replay workers exited unexpectedly')
+
+def replay(records, config, by_word, overall):
+    """Replay the trace under one configuration and return its summary."""
+    context = multiprocessing.get_context('spawn')
+    request_queue = context.Queue()
+    result_queue = context.Queue()
+    workers = [
+        context.Process(target=worker_main, args=(config, by_word, overall, request_queue, result_queue))
+        for _ in range(config['workers'])
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        for _ in workers:
+            receive(result_queue, workers)  # Wait until every worker has imported the app
+
+        # Dispatch requests at their (compressed) trace times; a free worker picks up the next one
+        start = time.time()
+        first_timestamp = records[0]['timestamp']
+        for record in records:
+            arrival = start + (record['timestamp'] - first_timestamp) / config['speed']
+            delay = arrival - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            request_queue.put((arrival, record))
+
+        results = [receive(result_queue, workers)[1] for _ in records]
+    finally:
+        for _ in workers:
+            request_queue.put(None)
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    outcomes = defaultdict(int)
+    for outcome, _, _ in results:
+        outcomes[outcome] += 1
+    latencies_ms = [latency * 1000 for _, latency, _ in results]
+    elapsed = max(finished for _, _, finished in results) - start
+
+    return {
+        'cache_size': config['cache_size'],
+        'ttl': config['ttl'],
+        'workers': config['workers'],
+        'requests': len(results),
+        'hit_ratio': round(outcomes['hit'] / len(results), 3),
+        'partial_ratio': round(outcomes['partial'] / len(results), 3),
+        'errors': outcomes['error'],
+        'throughput': round(len(results) / elapsed, 2) if elapsed > 0 else None,
+        'p50_ms': round(percentile(latencies_ms, 50), 1),
+        'p95_ms': round(percentile(latencies_ms, 95), 1),
+        'p99_ms': round(percentile(latencies_ms, 99), 1),
+        'mean_ms': round(statistics.mean(latencies_ms), 1)
+    }
+
+def parse_list(value, cast):
+    """Parse a comma-separated command line list."""
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a captured search trace against the app.')
+    parser.add_argument('trace', help='JSONL trace written by the app when TRACE_FILE is set')
+    parser.add_argument('--cache-sizes', default='0', help='Comma-separated CACHE_MAX_SIZE values (0 = unbounded)')
+    parser.add_argument('--ttls', default='86400', help='Comma-separated CACHE_TTL values in seconds')
+    parser.add_argument('--workers', default='1', help='Comma-separated worker process counts')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay this many times faster than recorded')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='Multiply recorded stage latencies')
+    parser.add_argument('--deadline', type=float, default=None, help='Search deadline sent with each request')
+    parser.add_argument('--limit', type=int, default=None, help='Only replay the first N records')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for picking recorded latencies')
+    parser.add_argument('--json', action='store_true', help='Print one JSON summary per line')
+    args = parser.parse_args()
+
+    if args.speed <= 0:
+        parser.error('--speed must be positive')
+    worker_counts = parse_list(args.workers, int)
+    if not worker_counts or min(worker_counts) < 1:
+        parser.error('--workers must be at least 1')
+
+    records = load_trace(args.trace, args.limit)
+    if not records:
+        parser.error(f'No search records found in {args.trace}')
+    by_word, overall = collect_stage_samples(records)
+
+    columns = ['cache_size', 'ttl', 'workers', 'requests', 'hit_ratio', 'partial_ratio',
+               'errors', 'throughput', 'p50_ms', 'p95_ms', 'p99_ms']
+    if not args.json:
+        print('  '.join(f'{column:>13}' for column in columns))
+
+    for cache_size, ttl, workers in itertools.product(
+        parse_list(args.cache_sizes, int),
+        parse_list(args.ttls, float),
+        worker_counts
+    ):
+        config = {
+            'cache_size': cache_size,
+            'ttl': ttl,
+            'workers': workers,
+            'speed': args.speed,
+            'latency_scale': args.latency_scale,
+            'deadline': args.deadline,
+            'seed': args.seed
+        }
+        try:
+            summary = replay(records, config, by_word, overall)
+        except RuntimeError as e:
+            sys.exit(f'Replay failed: {str(e)}')
+        if args.json:
+            print(json.dumps(summary))
+        else:
+            print('  '.join(f'{str(summary[column]):>13}' for column in columns))
+        sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()